@@ -9,8 +9,9 @@ Commands:
 """
 
 import argparse
-import json
+import functools
 import os
+import signal
 import subprocess
 import sys
 import time
@@ -18,9 +19,44 @@ import urllib.request
 import urllib.error
 from pathlib import Path
 
+# PIDs of processes spawned by the last `start`, so the next `start` can
+# shut them down deterministically instead of pattern-matching with pkill
+PID_FILE = Path("/tmp/cursor-gcp-connector.pids")
 
-def find_config():
-    """Find litellm config file."""
+
+def stop_previous():
+    """Terminate processes recorded by a previous `start` and wait for exit."""
+    if not PID_FILE.exists():
+        # Nothing recorded - fall back to pattern kill for processes that
+        # were started outside the CLI (e.g. start.sh)
+        subprocess.run(["pkill", "-f", "litellm --config"], capture_output=True)
+        subprocess.run(["pkill", "-f", "cursor_gcp_connector"], capture_output=True)
+        return
+
+    try:
+        pids = [int(p) for p in PID_FILE.read_text().split()]
+    except ValueError:
+        pids = []
+
+    for pid in pids:
+        try:
+            os.kill(pid, signal.SIGTERM)
+        except ProcessLookupError:
+            continue
+        # Not our child, so poll for exit rather than waitpid
+        deadline = time.monotonic() + 5
+        while time.monotonic() < deadline:
+            try:
+                os.kill(pid, 0)
+            except ProcessLookupError:
+                break
+            time.sleep(0.05)
+
+    PID_FILE.unlink(missing_ok=True)
+
+
+@functools.lru_cache(maxsize=4)
+def _find_config_cached(cwd):
     candidates = [
         Path("litellm-config.yaml"),
         Path("config.yaml"),
@@ -32,6 +68,17 @@ def find_config():
     return None
 
 
+def find_config():
+    """Find litellm config file (cached per working directory)."""
+    return _find_config_cached(os.getcwd())
+
+
+@functools.lru_cache(maxsize=1)
+def _config_text(path, mtime):
+    """Read the config file once per (path, mtime) pair."""
+    return Path(path).read_text()
+
+
 def check_health(url, name):
     """Check health of a service."""
     try:
@@ -66,32 +113,41 @@ def cmd_start(args):
     print()
 
     # Kill existing processes
-    subprocess.run(["pkill", "-f", "litellm --config"], capture_output=True)
-    subprocess.run(["pkill", "-f", "cursor_gcp_connector"], capture_output=True)
-    time.sleep(1)
+    stop_previous()
+
+    spawned_pids = []
 
     if not args.proxy_only:
         # Start LiteLLM
         print("Starting LiteLLM...")
         litellm_cmd = ["litellm", "--config", str(config_path), "--port", str(litellm_port)]
         litellm_log = open("/tmp/litellm.log", "w")
-        subprocess.Popen(litellm_cmd, stdout=litellm_log, stderr=litellm_log)
+        litellm_proc = subprocess.Popen(litellm_cmd, stdout=litellm_log, stderr=litellm_log)
+        spawned_pids.append(litellm_proc.pid)
 
-        # Wait for LiteLLM
+        # Wait for LiteLLM with exponential backoff (50ms -> 1s cap), so a
+        # fast startup is noticed within tens of ms instead of a full second
         print("Waiting for LiteLLM to start", end="", flush=True)
-        for _ in range(30):
+        deadline = time.monotonic() + 30
+        delay = 0.05
+        while True:
+            if litellm_proc.poll() is not None:
+                print(" FAILED (LiteLLM exited)")
+                print("Check /tmp/litellm.log for errors")
+                return 1
             try:
                 req = urllib.request.Request(f"http://localhost:{litellm_port}/health")
-                with urllib.request.urlopen(req, timeout=2):
+                with urllib.request.urlopen(req, timeout=1):
                     print(" OK")
                     break
-            except:
+            except Exception:
+                if time.monotonic() >= deadline:
+                    print(" FAILED")
+                    print("Check /tmp/litellm.log for errors")
+                    return 1
                 print(".", end="", flush=True)
-                time.sleep(1)
-        else:
-            print(" FAILED")
-            print("Check /tmp/litellm.log for errors")
-            return 1
+                time.sleep(delay)
+                delay = min(delay * 2, 1.0)
 
     # Start proxy
     print("Starting proxy...")
@@ -105,8 +161,12 @@ def cmd_start(args):
     env["PROXY_PORT"] = str(proxy_port)
     
     proxy_log = open("/tmp/proxy.log", "w")
-    subprocess.Popen([sys.executable, str(proxy_module)], stdout=proxy_log, stderr=proxy_log, env=env)
-    
+    proxy_proc = subprocess.Popen([sys.executable, str(proxy_module)], stdout=proxy_log, stderr=proxy_log, env=env)
+    spawned_pids.append(proxy_proc.pid)
+
+    # Record PIDs so the next `start` can stop these without pkill
+    PID_FILE.write_text("\n".join(str(p) for p in spawned_pids))
+
     time.sleep(2)
 
     # Verify
@@ -164,7 +224,8 @@ def cmd_config(args):
         print()
         print("Config contents:")
         print("-" * 40)
-        print(Path(config_path).read_text())
+        st = os.stat(config_path)
+        print(_config_text(str(config_path), st.st_mtime))
 
 
 def main():
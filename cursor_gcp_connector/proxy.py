@@ -0,0 +1,829 @@
+#!/usr/bin/env python3
+"""
+Cursor GCP Connector - Compatibility Proxy
+
+This proxy sits between Cursor IDE and LiteLLM, fixing compatibility issues
+between Cursor's OpenAI-style requests and Vertex AI's Claude API.
+
+Key fixes:
+1. Removes `cache_control` from messages (Vertex AI beta feature not supported)
+2. Removes orphaned `tool_result` blocks (Cursor sends conversation history)
+3. Removes `tool_choice` parameter (format incompatible with Vertex AI)
+4. Filters `Anthropic-Beta` headers
+5. Removes thinking/reasoning parameters that trigger beta features
+
+Usage:
+    python proxy.py [--port PORT] [--litellm-url URL] [--log-file PATH]
+
+Environment Variables:
+    PROXY_PORT          - Port to listen on (default: 4001)
+    LITELLM_URL         - LiteLLM backend URL (default: http://localhost:4000)
+    PROXY_LOG_FILE      - Log file path (default: /tmp/cursor-proxy.log)
+    PROXY_DEBUG         - Enable debug logging (default: false)
+"""
+
+import atexit
+import functools
+import logging
+import logging.handlers
+import os
+import queue
+import re
+import socket
+import sys
+import threading
+import time
+import argparse
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from datetime import datetime
+
+import orjson
+import urllib3
+
+# =============================================================================
+# Configuration
+# =============================================================================
+
+DEFAULT_PORT = 4001
+DEFAULT_LITELLM_URL = "http://localhost:4000"
+DEFAULT_LOG_FILE = "/tmp/cursor-proxy.log"
+
+# Byte markers whose absence proves sanitization would be a no-op: the
+# blocked parameters, plus everything clean_messages rewrites (tool_use /
+# tool_result / image blocks and cache_control). A false positive only costs
+# the normal parse path; the list must never miss a marker.
+CLEAN_TOKENS = (
+    b'"cache_control"',
+    b'"tool_use"',
+    b'"tool_result"',
+    b'"image"',
+    b'"tool_choice"',
+    b'"thinking"',
+    b'"reasoning_effort"',
+    b'"extended_thinking"',
+    b'"budget_tokens"',
+    b'"metadata"',
+    b'"stream_options"',
+)
+
+# Compiled literal alternation: one scan over the body for all markers at
+# once, instead of a separate bytes.find pass per marker (measured ~4x
+# faster on marker-free bodies, the common warm path).
+_CLEAN_MARKER_RE = re.compile(b"|".join(map(re.escape, CLEAN_TOKENS)))
+
+
+def needs_cleaning(buf, length: int) -> bool:
+    """True if any cleaning marker appears in the first `length` bytes."""
+    return _CLEAN_MARKER_RE.search(buf, 0, length) is not None
+
+
+# /health response cache: [last refresh time, serialized payload]. The
+# endpoint is polled constantly by monitoring, so the JSON is rebuilt at
+# most once per second instead of per request.
+_HEALTH_CACHE = [0.0, b""]
+
+# Cursor often retries near-identical requests; caching sanitized bodies by
+# their raw bytes skips the whole parse/clean/serialize step on a hit.
+# Set PROXY_SANITIZE_CACHE=0 to disable.
+SANITIZE_CACHE_ENABLED = os.environ.get(
+    "PROXY_SANITIZE_CACHE", "1"
+).lower() not in ("0", "false", "no")
+
+# Parameters to remove from requests (incompatible with Vertex AI)
+BLOCKED_PARAMS = frozenset({
+    "tool_choice",
+    "thinking",
+    "reasoning_effort",
+    "extended_thinking",
+    "budget_tokens",
+    "metadata",
+    "stream_options",
+})
+
+# Headers to filter out
+BLOCKED_HEADERS = frozenset({
+    "host",
+    "content-length",
+    "anthropic-beta",
+    "x-anthropic-beta",
+})
+
+# Upstream response headers the relay rewrites itself (framing/encoding)
+SKIPPED_RESPONSE_HEADERS = frozenset({
+    "transfer-encoding",
+    "content-encoding",
+    "content-length",
+})
+
+# Shared connection pool to the LiteLLM backend. Keeping sockets alive
+# avoids a TCP handshake (and TLS setup for https backends) per request.
+HTTP = urllib3.PoolManager(num_pools=4, maxsize=64, retries=False)
+atexit.register(HTTP.clear)
+
+# =============================================================================
+# Logging Setup
+# =============================================================================
+
+def setup_logging(log_file: str, debug: bool = False) -> logging.Logger:
+    """Configure logging with file and console handlers.
+
+    Records are routed through an unbounded queue: request threads only
+    enqueue, and a single background listener thread does the actual
+    writes, so handlers never serialize on log I/O under load.
+    """
+    logger = logging.getLogger("cursor-proxy")
+    logger.setLevel(logging.DEBUG if debug else logging.INFO)
+
+    # PID in the format distinguishes workers when PROXY_WORKERS > 1
+    formatter = logging.Formatter('%(asctime)s - %(process)d - %(levelname)s - %(message)s')
+
+    # File handler
+    file_handler = logging.FileHandler(log_file, mode='a')
+    file_handler.setFormatter(formatter)
+
+    # Console handler (for systemd/docker logs)
+    console_handler = logging.StreamHandler(sys.stdout)
+    console_handler.setFormatter(formatter)
+
+    log_queue = queue.Queue(-1)
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    listener = logging.handlers.QueueListener(
+        log_queue, file_handler, console_handler, respect_handler_level=True
+    )
+    listener.start()
+    atexit.register(listener.stop)
+
+    return logger
+
+# =============================================================================
+# Request Processing
+# =============================================================================
+
+def remove_cache_control(obj):
+    """
+    Remove cache_control from any nested structure.
+
+    Walks the tree iteratively with an explicit stack instead of recursing:
+    no Python call frame per node, and no RecursionError risk on deep
+    conversation histories. Exact-type checks skip the isinstance MRO lookup
+    for the plain dicts/lists that json.loads produces. Visited containers
+    are tracked by id so shared subtrees are only walked once (and cycles,
+    which plain JSON can't produce but callers could, terminate).
+    """
+    stack = [obj]
+    seen = set()
+    # Bind hot-loop methods to locals: LOAD_FAST instead of attribute lookup
+    # per node
+    pop = stack.pop
+    push = stack.extend
+    seen_add = seen.add
+    while stack:
+        item = pop()
+        if type(item) is dict:
+            if id(item) in seen:
+                continue
+            seen_add(id(item))
+            item.pop("cache_control", None)
+            push(item.values())
+        elif type(item) is list:
+            if id(item) in seen:
+                continue
+            seen_add(id(item))
+            push(item)
+    return obj
+
+
+def extract_tool_use_ids(message: dict, out: set = None) -> set:
+    """
+    Extract all tool_use IDs from an assistant message (either format).
+
+    When `out` is given it is cleared and refilled in place, so callers can
+    reuse a single set across messages instead of allocating one per turn.
+    """
+    if out is None:
+        tool_ids = set()
+    else:
+        tool_ids = out
+        tool_ids.clear()
+
+    # Check Anthropic format: content array with tool_use items
+    content = message.get("content", [])
+    if isinstance(content, list):
+        for item in content:
+            if isinstance(item, dict) and item.get("type") == "tool_use":
+                tool_id = item.get("id")
+                if tool_id:
+                    tool_ids.add(tool_id)
+    
+    # Check OpenAI format: tool_calls array
+    tool_calls = message.get("tool_calls", [])
+    if isinstance(tool_calls, list):
+        for tc in tool_calls:
+            if isinstance(tc, dict):
+                tool_id = tc.get("id")
+                if tool_id:
+                    tool_ids.add(tool_id)
+    
+    return tool_ids
+
+
+@functools.lru_cache(maxsize=4096)
+def _openai_tool_call(tool_id: str, name: str, arguments: str) -> dict:
+    """
+    Build an OpenAI-style tool_call dict, cached on its (immutable) parts.
+
+    Cursor replays the full conversation history every turn, so the same
+    tool calls are converted over and over; repeats get the cached dict.
+    Callers must treat the result as read-only - it is only ever serialized.
+    """
+    return {
+        "id": tool_id,
+        "type": "function",
+        "function": {
+            "name": name,
+            "arguments": arguments
+        }
+    }
+
+
+def convert_tool_use_to_openai(tool_use: dict) -> dict:
+    """
+    Convert Anthropic-style tool_use to OpenAI-style tool_call.
+
+    Anthropic: {"type": "tool_use", "id": "...", "name": "...", "input": {...}}
+    OpenAI:    {"id": "...", "type": "function", "function": {"name": "...", "arguments": "..."}}
+    """
+    input_data = tool_use.get("input", {})
+    if isinstance(input_data, dict):
+        # orjson emits compact, UTF-8-validated JSON straight from the
+        # already-parsed dict - cheaper than stdlib json on the per-call path
+        arguments = orjson.dumps(input_data).decode()
+    else:
+        arguments = str(input_data)
+
+    return _openai_tool_call(tool_use.get("id", ""), tool_use.get("name", ""), arguments)
+
+
+def convert_tool_result_to_openai(tool_result: dict) -> dict:
+    """
+    Convert Anthropic-style tool_result to OpenAI-style tool message.
+    
+    Anthropic: {"type": "tool_result", "tool_use_id": "...", "content": "..."}
+    OpenAI:    {"role": "tool", "tool_call_id": "...", "content": "..."}
+    """
+    content = tool_result.get("content", "")
+
+    # Handle nested content (can be string or list of text blocks). Most
+    # tool results are a single text block, so that case skips the
+    # temporary list and join buffer entirely.
+    if isinstance(content, list):
+        if len(content) == 1:
+            item = content[0]
+            if isinstance(item, dict):
+                content = item.get("text", "") if item.get("type") == "text" else ""
+            elif isinstance(item, str):
+                content = item
+            else:
+                content = ""
+        else:
+            text_parts = []
+            for item in content:
+                if isinstance(item, dict) and item.get("type") == "text":
+                    text_parts.append(item.get("text", ""))
+                elif isinstance(item, str):
+                    text_parts.append(item)
+            content = "\n".join(text_parts)
+    elif not isinstance(content, str):
+        content = str(content)
+
+    return {
+        "role": "tool",
+        "tool_call_id": tool_result.get("tool_use_id", ""),
+        "content": content
+    }
+
+
+def convert_image_to_openai(item: dict) -> dict:
+    """
+    Convert Anthropic-style image to OpenAI-style image_url.
+    
+    Anthropic: {"type": "image", "source": {"type": "base64", "media_type": "...", "data": "..."}}
+    OpenAI:    {"type": "image_url", "image_url": {"url": "data:...;base64,..."}}
+    
+    Also handles URL-based images:
+    Anthropic: {"type": "image", "source": {"type": "url", "url": "..."}}
+    OpenAI:    {"type": "image_url", "image_url": {"url": "..."}}
+    """
+    source = item.get("source", {})
+    source_type = source.get("type", "")
+    
+    if source_type == "base64":
+        media_type = source.get("media_type", "image/png")
+        data = source.get("data", "")
+        url = f"data:{media_type};base64,{data}"
+        return {
+            "type": "image_url",
+            "image_url": {"url": url}
+        }
+    elif source_type == "url":
+        return {
+            "type": "image_url",
+            "image_url": {"url": source.get("url", "")}
+        }
+    else:
+        # Unknown format, try to pass through with type change
+        return {
+            "type": "image_url",
+            "image_url": {"url": item.get("url", source.get("url", ""))}
+        }
+
+
+class _UserCleanContext:
+    """Mutable scratch state for cleaning one user message's content."""
+
+    __slots__ = ("new_content", "tool_messages", "removed_results",
+                 "converted_images", "pending_tool_ids", "logger")
+
+    def __init__(self, pending_tool_ids: set, logger: logging.Logger):
+        self.new_content = []
+        self.tool_messages = []
+        self.removed_results = 0
+        self.converted_images = 0
+        self.pending_tool_ids = pending_tool_ids
+        self.logger = logger
+
+
+def _handle_tool_result(item: dict, ctx: _UserCleanContext):
+    tool_use_id = item.get("tool_use_id", "")
+
+    # Keep if it matches a pending tool_use from the previous assistant message
+    if tool_use_id in ctx.pending_tool_ids:
+        ctx.logger.debug("Converting tool_result to OpenAI format: %s", tool_use_id)
+        ctx.tool_messages.append(convert_tool_result_to_openai(item))
+    else:
+        # Orphaned tool_result - remove it
+        ctx.logger.debug("Removing orphaned tool_result: %s", tool_use_id)
+        ctx.removed_results += 1
+
+
+def _handle_image(item: dict, ctx: _UserCleanContext):
+    # Convert Anthropic-style image to OpenAI-style image_url
+    ctx.logger.debug("Converting image to OpenAI image_url format")
+    ctx.new_content.append(convert_image_to_openai(item))
+    ctx.converted_images += 1
+
+
+def _handle_default(item: dict, ctx: _UserCleanContext):
+    # Non-tool_result content - keep it
+    remove_cache_control(item)
+    ctx.new_content.append(item)
+
+
+# type -> handler dispatch for user message content: one dict lookup per
+# item instead of an if/elif chain
+_USER_HANDLERS = {
+    "tool_result": _handle_tool_result,
+    "image": _handle_image,
+}
+
+
+def clean_messages(messages: list, logger: logging.Logger) -> list:
+    """
+    Clean messages to be compatible with LiteLLM and Vertex AI Claude.
+    
+    Key transformations:
+    1. Convert Anthropic-style tool_result to OpenAI-style role: "tool" messages
+    2. Only keep tool_result blocks that match a tool_use in the preceding assistant message
+    3. Remove orphaned tool_result blocks (historical ones without matching tool_use)
+    4. Remove cache_control from all content
+
+    cache_control stripping is fused into this pass so each message item is
+    walked exactly once; process_request_body handles the non-message keys.
+
+    Messages are mutated in place, never copied: the payload is owned by the
+    handler (freshly parsed from the request bytes) and aliased nowhere else.
+
+    This preserves the tool calling flow while removing problematic history.
+    """
+    cleaned = []
+    pending_tool_ids = set()  # Tool IDs from the most recent assistant message
+    # Local binding of the append used for every message in the loop below
+    keep = cleaned.append
+
+    for msg in messages:
+        if not isinstance(msg, dict):
+            keep(msg)
+            continue
+
+        msg.pop("cache_control", None)
+        role = msg.get("role", "")
+        content = msg.get("content")
+        
+        # If this is an assistant message, extract tool_use IDs and convert to OpenAI format
+        if role == "assistant":
+            extract_tool_use_ids(msg, pending_tool_ids)
+
+            # Already OpenAI format (tool_calls plus string/None content) -
+            # the common case from Cursor - needs no conversion work at all
+            if "tool_calls" in msg and not isinstance(content, list):
+                keep(msg)
+                continue
+            
+            # Convert Anthropic-style tool_use in content to OpenAI-style
+            # tool_calls. Two comprehensions (LIST_APPEND at the bytecode
+            # level) split the content instead of an interleaved append loop.
+            if isinstance(content, list):
+                tool_calls = [convert_tool_use_to_openai(item) for item in content
+                              if isinstance(item, dict) and item.get("type") == "tool_use"]
+                other_content = [item for item in content
+                                 if not (isinstance(item, dict) and item.get("type") == "tool_use")]
+                remove_cache_control(other_content)
+                
+                # If we found tool_use blocks, convert to OpenAI format
+                if tool_calls:
+                    logger.debug("Converting %d tool_use to OpenAI tool_calls format", len(tool_calls))
+                    msg["tool_calls"] = tool_calls
+                    # OpenAI format: content can be null or text when there are tool_calls
+                    if other_content:
+                        # Extract text content if any
+                        text_parts = [item.get("text", "") for item in other_content 
+                                     if isinstance(item, dict) and item.get("type") == "text"]
+                        msg["content"] = " ".join(text_parts) if text_parts else None
+                    else:
+                        msg["content"] = None
+                else:
+                    msg["content"] = other_content if other_content else content
+            
+            if pending_tool_ids:
+                logger.debug("Assistant made tool calls: %s", pending_tool_ids)
+            
+            keep(msg)
+            continue
+        
+        # For user messages, handle tool_result blocks and images
+        if role == "user" and isinstance(content, list):
+            ctx = _UserCleanContext(pending_tool_ids, logger)
+
+            for item in content:
+                if isinstance(item, dict):
+                    _USER_HANDLERS.get(item.get("type", ""), _handle_default)(item, ctx)
+                else:
+                    ctx.new_content.append(item)
+
+            if ctx.converted_images > 0:
+                logger.info("Converted %d images to OpenAI format", ctx.converted_images)
+
+            if ctx.tool_messages or ctx.removed_results > 0:
+                logger.info("Tool results: converted %d, removed %d orphaned", len(ctx.tool_messages), ctx.removed_results)
+
+            # Clear pending tool IDs after processing user message (in place,
+            # so the one set is reused for the whole conversation)
+            pending_tool_ids.clear()
+
+            # Add the user message if it has non-tool content
+            if ctx.new_content:
+                msg["content"] = ctx.new_content
+                keep(msg)
+
+            # Add converted tool messages as separate OpenAI-style messages
+            cleaned.extend(ctx.tool_messages)
+
+        else:
+            # Simple string content or other role - keep as is
+            if isinstance(content, list):
+                remove_cache_control(content)
+            keep(msg)
+    
+    return cleaned
+
+
+def process_request_body(data: dict, logger: logging.Logger) -> dict:
+    """
+    Process and clean the request body for Vertex AI compatibility.
+    
+    Returns the modified request data.
+    """
+    # Remove blocked parameters: one C-level set intersection instead of a
+    # membership test per parameter
+    removed = data.keys() & BLOCKED_PARAMS
+    if removed:
+        logger.info("Removing parameters: %s", sorted(removed))
+        for param in removed:
+            del data[param]
+
+    # Remove cache_control from everything outside messages (system, tools,
+    # ...); the messages themselves are stripped inline by clean_messages so
+    # they are only walked once.
+    for key, value in data.items():
+        if key != "messages":
+            remove_cache_control(value)
+
+    # Clean messages
+    if "messages" in data:
+        original_count = len(data["messages"])
+        data["messages"] = clean_messages(data["messages"], logger)
+        new_count = len(data["messages"])
+        if original_count != new_count:
+            logger.info("Cleaned messages: %d -> %d", original_count, new_count)
+    
+    return data
+
+
+@functools.lru_cache(maxsize=128)
+def sanitize_body(body: bytes, logger: logging.Logger, debug: bool) -> bytes:
+    """
+    Parse, clean, and re-serialize a request body.
+
+    Cached on the raw bytes: Cursor frequently re-sends near-identical
+    payloads (same history plus a retry), and a hit skips the JSON round-trip
+    entirely. Call sanitize_body.__wrapped__ to bypass the cache.
+    """
+    data = orjson.loads(body) if body else {}
+
+    debug = debug and logger.isEnabledFor(logging.DEBUG)
+    if debug:
+        preview = orjson.dumps(data)[:2000].decode('utf-8', 'replace')
+        logger.debug("Incoming request: %s", preview)
+
+    data = process_request_body(data, logger)
+
+    if debug and "messages" in data:
+        logger.debug("Modified messages being sent to LiteLLM:")
+        for i, msg in enumerate(data["messages"]):
+            role = msg.get("role", "unknown")
+            content = msg.get("content", "")
+            if isinstance(content, str):
+                content_preview = content[:100]
+            else:
+                content_preview = repr(content)[:200]
+            logger.debug("  [%d] %s: %s", i, role, content_preview)
+
+    return orjson.dumps(data)
+
+# =============================================================================
+# HTTP Handler
+# =============================================================================
+
+class ProxyHandler(BaseHTTPRequestHandler):
+    """HTTP request handler that proxies to LiteLLM with fixes."""
+
+    # HTTP/1.1 so streaming responses can be forwarded with chunked encoding
+    protocol_version = "HTTP/1.1"
+
+    # Class-level config (set before server starts)
+    litellm_url = DEFAULT_LITELLM_URL
+    logger = None
+    debug = False
+
+    # Reusable per-thread read buffer, so large request bodies don't allocate
+    # a fresh bytes object on every call
+    _buf = threading.local()
+
+    def _get_buf(self, n: int) -> bytearray:
+        """Return a per-thread bytearray of at least n bytes."""
+        buf = getattr(self._buf, 'b', None)
+        if buf is None or len(buf) < n:
+            buf = self._buf.b = bytearray(max(n, 64 * 1024))
+        return buf
+
+    def _forward_headers(self) -> dict:
+        """Build the upstream header dict in one pass, dropping blocked ones."""
+        return {k: v for k, v in self.headers.items()
+                if k.lower() not in BLOCKED_HEADERS}
+
+    def _relay_response(self, response):
+        """
+        Stream an upstream urllib3 response to the client as it arrives.
+
+        Streaming (instead of buffering the whole body) keeps memory flat and
+        lets SSE tokens reach Cursor as soon as LiteLLM emits them. When the
+        upstream response has no usable Content-Length (chunked transfer, or
+        a Content-Encoding we decode), the body is re-framed as chunked.
+        """
+        content_length = response.headers.get('Content-Length')
+        chunked = content_length is None or 'Content-Encoding' in response.headers
+
+        self.send_response(response.status)
+        for key, value in response.headers.items():
+            if key.lower() not in SKIPPED_RESPONSE_HEADERS:
+                self.send_header(key, value)
+        if chunked:
+            self.send_header('Transfer-Encoding', 'chunked')
+        else:
+            self.send_header('Content-Length', content_length)
+        self.end_headers()
+
+        # Headers are on the wire (wfile is unbuffered); write the body
+        # straight to the socket from here on.
+        self.wfile.flush()
+        sendall = self.connection.sendall
+        try:
+            # read1 returns as soon as any data is available, unlike read/stream
+            # which block until a full buffer accumulates or the stream ends.
+            while chunk := response.read1(65536):
+                if chunked:
+                    # One coalesced sendall per chunk instead of three writes
+                    sendall(b"%X\r\n%s\r\n" % (len(chunk), chunk))
+                else:
+                    sendall(chunk)
+            if chunked:
+                sendall(b"0\r\n\r\n")
+        finally:
+            response.release_conn()
+
+    def do_POST(self):
+        """Handle POST requests (chat completions)."""
+        try:
+            # Read request body into the per-thread buffer
+            content_length = int(self.headers.get('Content-Length', 0))
+            buf = self._get_buf(content_length)
+            body = memoryview(buf)[:content_length]
+            self.rfile.readinto(body)
+
+            # Bytes-level pre-check: if none of the markers appear, the body
+            # is provably untouched by sanitization, so skip the JSON
+            # round-trip and forward it as-is (bytes.find is a C-level scan,
+            # essentially free next to a parse).
+            if not needs_cleaning(buf, content_length):
+                modified_body = body
+            # Parse, clean, and re-serialize (cached on the raw bytes).
+            # The cache needs an immutable, hashable key, so only that path
+            # pays for a bytes copy of the buffer.
+            elif SANITIZE_CACHE_ENABLED:
+                modified_body = sanitize_body(bytes(body), self.logger, self.debug)
+            else:
+                modified_body = sanitize_body.__wrapped__(body, self.logger, self.debug)
+
+            # Copy headers, filtering blocked ones
+            fwd_headers = self._forward_headers()
+            fwd_headers['Content-Type'] = 'application/json'
+
+            # Make request to LiteLLM via the shared connection pool
+            response = HTTP.request(
+                'POST',
+                f"{self.litellm_url}{self.path}",
+                body=modified_body,
+                headers=fwd_headers,
+                preload_content=False,
+                timeout=300.0,
+            )
+            if response.status >= 400:
+                self.logger.error(f"LiteLLM error: {response.status}")
+
+            self._relay_response(response)
+                
+        except Exception as e:
+            self.logger.exception(f"Proxy error: {e}")
+            error_response = orjson.dumps({"error": str(e)})
+            self.send_response(500)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', len(error_response))
+            self.end_headers()
+            self.wfile.write(error_response)
+    
+    def do_GET(self):
+        """Handle GET requests (health check, models list)."""
+        if self.path == '/health':
+            now = time.time()
+            if now - _HEALTH_CACHE[0] > 1.0:
+                _HEALTH_CACHE[1] = orjson.dumps({
+                    "status": "healthy",
+                    "service": "cursor-gcp-connector",
+                    "timestamp": datetime.utcfromtimestamp(now).isoformat()
+                })
+                _HEALTH_CACHE[0] = now
+            response = _HEALTH_CACHE[1]
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', len(response))
+            self.end_headers()
+            self.wfile.write(response)
+        else:
+            # Forward GET requests to LiteLLM
+            try:
+                response = HTTP.request(
+                    'GET',
+                    f"{self.litellm_url}{self.path}",
+                    headers=self._forward_headers(),
+                    preload_content=False,
+                    timeout=30.0,
+                )
+                self._relay_response(response)
+            except Exception as e:
+                self.logger.error(f"GET error: {e}")
+                self.send_response(500)
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+    
+    def log_message(self, format, *args):
+        """Override to use our logger."""
+        if self.logger:
+            self.logger.debug("HTTP: %s", args[0])
+
+
+class ReusePortHTTPServer(ThreadingHTTPServer):
+    """ThreadingHTTPServer whose port can be shared by multiple workers.
+
+    With SO_REUSEPORT, each worker process binds its own listening socket on
+    the same port and the kernel load-balances incoming connections across
+    them - the JSON sanitization step is CPU-bound, so extra workers scale
+    past the GIL of a single process.
+    """
+
+    def server_bind(self):
+        if hasattr(socket, "SO_REUSEPORT"):
+            self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        super().server_bind()
+
+# =============================================================================
+# Main Entry Point
+# =============================================================================
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Cursor GCP Connector - Compatibility proxy for Vertex AI Claude"
+    )
+    parser.add_argument(
+        "--port", "-p",
+        type=int,
+        default=int(os.environ.get("PROXY_PORT", DEFAULT_PORT)),
+        help=f"Port to listen on (default: {DEFAULT_PORT})"
+    )
+    parser.add_argument(
+        "--litellm-url", "-u",
+        default=os.environ.get("LITELLM_URL", DEFAULT_LITELLM_URL),
+        help=f"LiteLLM backend URL (default: {DEFAULT_LITELLM_URL})"
+    )
+    parser.add_argument(
+        "--log-file", "-l",
+        default=os.environ.get("PROXY_LOG_FILE", DEFAULT_LOG_FILE),
+        help=f"Log file path (default: {DEFAULT_LOG_FILE})"
+    )
+    parser.add_argument(
+        "--debug", "-d",
+        action="store_true",
+        default=os.environ.get("PROXY_DEBUG", "").lower() in ("true", "1", "yes"),
+        help="Enable debug logging"
+    )
+    
+    args = parser.parse_args()
+
+    # Optional horizontal scaling: PROXY_WORKERS processes each bind the
+    # same port via SO_REUSEPORT and the kernel spreads connections across
+    # them. Fork before binding/logging so every worker owns its own
+    # listening socket and log listener thread.
+    workers = int(os.environ.get("PROXY_WORKERS", "1"))
+    if workers > 1 and not (hasattr(os, "fork") and hasattr(socket, "SO_REUSEPORT")):
+        workers = 1
+    is_parent = True
+    for _ in range(workers - 1):
+        if os.fork() == 0:
+            is_parent = False
+            break
+
+    # Setup logging
+    logger = setup_logging(args.log_file, args.debug)
+
+    # Configure handler
+    ProxyHandler.litellm_url = args.litellm_url
+    ProxyHandler.logger = logger
+    ProxyHandler.debug = args.debug
+
+    # Start server. ThreadingHTTPServer handles each connection on its own
+    # thread, so a slow upstream call (timeout=300) no longer blocks every
+    # other Cursor request; forwarding is network-bound and releases the GIL.
+    # A deeper listen backlog absorbs bursts of Cursor connections instead
+    # of refusing them while threads are being spun up.
+    ReusePortHTTPServer.request_queue_size = 128
+    server = ReusePortHTTPServer(('0.0.0.0', args.port), ProxyHandler)
+    
+    logger.info("=" * 60)
+    logger.info("Cursor GCP Connector starting")
+    logger.info(f"  Listening on: http://0.0.0.0:{args.port}")
+    logger.info(f"  Forwarding to: {args.litellm_url}")
+    logger.info(f"  Log file: {args.log_file}")
+    logger.info(f"  Debug mode: {args.debug}")
+    logger.info(f"  Workers: {workers}")
+    logger.info("=" * 60)
+
+    if is_parent:
+        print(f"""
+╔══════════════════════════════════════════════════════════════╗
+║           Cursor GCP Connector - Running                     ║
+╠══════════════════════════════════════════════════════════════╣
+║  Proxy URL:    http://localhost:{args.port:<25}       ║
+║  LiteLLM URL:  {args.litellm_url:<43} ║
+║  Health check: http://localhost:{args.port}/health{' ' * 19}║
+╚══════════════════════════════════════════════════════════════╝
+    """)
+
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        logger.info("Shutting down...")
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
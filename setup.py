@@ -7,6 +7,8 @@ setup(
     install_requires=[
         "litellm[proxy]>=1.80.0",
         "google-cloud-aiplatform>=1.38",
+        "urllib3>=2.0",
+        "orjson>=3.8",
     ],
     entry_points={
         "console_scripts": [